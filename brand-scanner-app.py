@@ -1,27 +1,48 @@
-import time
+import asyncio
+import codecs
+import os
 import re
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import repeat
 from urllib.parse import urljoin, urlparse
 
+import ahocorasick
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+import xxhash
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EncodingDetector
 import pandas as pd
 import streamlit as st
-
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# lxml's C tokenizer is much faster than the pure-Python html.parser;
+# fall back to the stdlib parser on installs where lxml is missing.
+try:
+    import lxml.html
+    from lxml import etree
+    HTML_PARSER = "lxml"
+except ImportError:
+    etree = None
+    HTML_PARSER = "html.parser"
+
+# Hyperscan (optional) matches all terms with SIMD literal matchers; without
+# it, term search uses the pyahocorasick automaton.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 # =======================
 # LOW-LEVEL HELPERS
 # =======================
 
-def is_internal_url(url: str, root_domain: str) -> bool:
-    try:
-        parsed = urlparse(url)
-        # Internal if same domain or relative
-        return parsed.netloc == "" or parsed.netloc == root_domain
-    except Exception:
-        return False
-
-
 EXCLUDE_PATTERNS = [
     ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp",
     ".css", ".js", ".ico",
@@ -30,37 +51,190 @@ EXCLUDE_PATTERNS = [
 ]
 
 
+# All exclude patterns as one alternation, matched in a single C-level scan
+_SKIP_RE = re.compile("|".join(re.escape(pat) for pat in EXCLUDE_PATTERNS))
+
+
+@lru_cache(maxsize=4096)
 def should_skip_url(url: str) -> bool:
-    lower = url.lower()
-    return any(pat in lower for pat in EXCLUDE_PATTERNS)
+    return _SKIP_RE.search(url.lower()) is not None
+
+
+USER_AGENT = "BrandScannerBot/1.0 (+https://example.com)"
+
+# Concurrency limits for page fetches
+MAX_CONNECTIONS = 20
+MAX_CONNECTIONS_PER_HOST = 8
+KEEPALIVE_TIMEOUT = 30
+
+# Pages advertised as larger than this are skipped without downloading
+MAX_PAGE_BYTES = 5_000_000
+
+# A fetched page: raw body plus the charset from its Content-Type header, if any
+Page = tuple[bytes, str | None]
+
+# Limits for page bodies kept across reruns
+PAGE_CACHE_MAX_BYTES = 256_000_000
+PAGE_CACHE_TTL = 3600
 
 
 def make_session() -> requests.Session:
     session = requests.Session()
-    session.headers.update(
-        {"User-Agent": "BrandScannerBot/1.0 (+https://example.com)"}
+    session.headers.update({"User-Agent": USER_AGENT, "Connection": "keep-alive"})
+
+    # Larger pool so concurrent requests reuse connections instead of opening new ones
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
     )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
     return session
 
 
-def fetch_html(session: requests.Session, url: str, timeout: int = 10) -> str | None:
+def make_async_session() -> aiohttp.ClientSession:
+    # Must be called from inside a running event loop
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector, headers={"User-Agent": USER_AGENT}
+    )
+
+
+class PageCache:
+    """
+    URL -> (ETag, page) of pages fetched on earlier runs, bounded by total
+    body size and entry age. Shared by every session's script thread, so
+    all access goes through a lock.
+    """
+
+    def __init__(self, max_bytes: int = PAGE_CACHE_MAX_BYTES, ttl: float = PAGE_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: dict[str, tuple[str, Page, float]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> tuple[str, Page] | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            etag, page, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                self._remove(url)
+                return None
+            return etag, page
+
+    def put(self, url: str, etag: str, page: Page) -> None:
+        if len(page[0]) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(url)
+            self._entries[url] = (etag, page, time.monotonic())
+            self._size += len(page[0])
+            # dicts keep insertion order, so the first key is the oldest entry
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, url: str) -> None:
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self._size -= len(entry[1][0])
+
+
+@st.cache_resource
+def get_page_cache() -> PageCache:
+    """
+    Page bodies kept across Streamlit reruns. Entries are revalidated with
+    If-None-Match, so a re-scan only re-downloads pages that changed.
+    """
+    return PageCache()
+
+
+async def fetch_html_async(
+    session: aiohttp.ClientSession,
+    url: str,
+    timeout: int = 10,
+    page_cache: PageCache | None = None,
+) -> Page | None:
+    # Return raw bytes plus the header charset: the parsers use the charset
+    # when there is one and otherwise sniff the encoding themselves (with
+    # cchardet when installed), which is far cheaper than decoding here.
+    cached = page_cache.get(url) if page_cache is not None else None
+    headers = {"If-None-Match": cached[0]} if cached else None
     try:
-        resp = session.get(url, timeout=timeout)
-        if resp.status_code != 200:
-            return None
-        if "text/html" not in resp.headers.get("Content-Type", ""):
-            return None
-        return resp.text
-    except requests.RequestException:
+        async with session.get(
+            url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as resp:
+            if resp.status == 304 and cached:
+                return cached[1]
+            if resp.status != 200:
+                return None
+            # Only headers have arrived so far; close() drops the connection
+            # instead of draining a body we don't want
+            if "text/html" not in resp.headers.get("Content-Type", ""):
+                resp.close()
+                return None
+            if (resp.content_length or 0) > MAX_PAGE_BYTES:
+                resp.close()
+                return None
+            page = (await resp.read(), resp.charset)
+
+            etag = resp.headers.get("ETag")
+            if page_cache is not None and etag:
+                page_cache.put(url, etag, page)
+            return page
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
         return None
 
 
-def get_urls_from_sitemap(session: requests.Session, sitemap_url: str) -> set[str]:
+async def fetch_html_polite(
+    session: aiohttp.ClientSession,
+    url: str,
+    host_limits: dict[str, asyncio.Semaphore],
+    delay: float,
+    page_cache: PageCache | None = None,
+) -> Page | None:
+    """
+    Fetch a page while holding its host's semaphore, then wait `delay`
+    seconds before releasing it. With a delay, requests to a host go one at
+    a time so the delay really separates them; without one, up to
+    MAX_CONNECTIONS_PER_HOST run in parallel.
+    """
+    host = urlparse(url).netloc
+    if host not in host_limits:
+        slots = 1 if delay > 0 else MAX_CONNECTIONS_PER_HOST
+        host_limits[host] = asyncio.Semaphore(slots)
+
+    async with host_limits[host]:
+        page = await fetch_html_async(session, url, page_cache=page_cache)
+        await asyncio.sleep(delay)
+    return page
+
+
+SITEMAP_WORKERS = 16
+
+
+def read_sitemap(session: requests.Session, sitemap_url: str) -> tuple[set[str], list[str]]:
+    """
+    Fetches one sitemap. Returns (page URLs, child sitemap URLs); a sitemap
+    index only has children.
+    """
     urls = set()
+    child_sitemaps = []
     try:
         resp = session.get(sitemap_url, timeout=10)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "xml")
+        soup = BeautifulSoup(resp.content, "xml")
 
         # Sitemap index case
         sitemap_tags = soup.find_all("sitemap")
@@ -68,8 +242,8 @@ def get_urls_from_sitemap(session: requests.Session, sitemap_url: str) -> set[st
             for sm in sitemap_tags:
                 loc = sm.find("loc")
                 if loc and loc.text:
-                    urls.update(get_urls_from_sitemap(session, loc.text.strip()))
-            return urls
+                    child_sitemaps.append(loc.text.strip())
+            return urls, child_sitemaps
 
         # Regular URL sitemap
         for url_tag in soup.find_all("url"):
@@ -79,95 +253,446 @@ def get_urls_from_sitemap(session: requests.Session, sitemap_url: str) -> set[st
     except Exception as e:
         st.warning(f"Error reading sitemap {sitemap_url}: {e}")
 
+    return urls, child_sitemaps
+
+
+def get_urls_from_sitemap(session: requests.Session, sitemap_url: str) -> set[str]:
+    urls = set()
+    # Every sitemap fetched so far, so cyclic indexes are read only once
+    visited = {sitemap_url}
+    level = [sitemap_url]
+
+    # Walk the index one level at a time; sitemaps on a level are independent
+    # downloads, so fetch them in parallel. Threads get this run's context so
+    # st.warning still shows.
+    with ThreadPoolExecutor(
+        max_workers=SITEMAP_WORKERS,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx()),
+    ) as pool:
+        while level:
+            futures = [pool.submit(read_sitemap, session, url) for url in level]
+            level = []
+            for future in as_completed(futures):
+                page_urls, child_sitemaps = future.result()
+                urls.update(page_urls)
+                for child in child_sitemaps:
+                    if child not in visited:
+                        visited.add(child)
+                        level.append(child)
+
     return urls
 
 
-def crawl_site(session: requests.Session, start_url: str, max_pages: int, delay: float) -> set[str]:
+# Each progress update is a websocket message, so send at most one per
+# PROGRESS_EVERY items or PROGRESS_INTERVAL seconds
+PROGRESS_EVERY = 10
+PROGRESS_INTERVAL = 0.1
+
+
+def progress_due(count: int, total: int, last_tick: float) -> bool:
+    return (
+        count % PROGRESS_EVERY == 0
+        or count == total
+        or time.monotonic() - last_tick > PROGRESS_INTERVAL
+    )
+
+
+# The crawler only needs links, so build nothing but <a href> tags
+_LINK_STRAINER = SoupStrainer("a", href=True)
+
+
+async def crawl_site(start_url: str, max_pages: int, delay: float) -> set[str]:
     root_domain = urlparse(start_url).netloc
-    to_visit = [start_url]
+    to_visit: asyncio.Queue[str] = asyncio.Queue()
+    to_visit.put_nowait(start_url)
+    # Everything ever queued, so a page linked from many others is queued once
+    queued = {start_url}
     seen = set()
     all_urls = set()
+    host_limits: dict[str, asyncio.Semaphore] = {}
+    page_cache = get_page_cache()
 
     progress_text = st.empty()
     progress_bar = st.progress(0.0)
+    last_tick = 0.0
 
-    while to_visit and len(seen) < max_pages:
-        current = to_visit.pop(0)
-        if current in seen:
-            continue
-        seen.add(current)
+    async def worker(session: aiohttp.ClientSession) -> None:
+        nonlocal last_tick
+        while True:
+            current = await to_visit.get()
+            try:
+                # Drain the rest of the frontier once the page budget is spent
+                if current in seen or len(seen) >= max_pages:
+                    continue
+                seen.add(current)
+
+                if should_skip_url(current):
+                    continue
+
+                if progress_due(len(seen), max_pages, last_tick):
+                    last_tick = time.monotonic()
+                    progress_text.text(f"Crawling {len(seen)}/{max_pages}: {current}")
+                    progress_bar.progress(len(seen) / max_pages)
+
+                page = await fetch_html_polite(
+                    session, current, host_limits, delay, page_cache
+                )
+                if page is None:
+                    continue
+                html, charset = page
+                if not html:
+                    continue
 
-        if should_skip_url(current):
-            continue
+                all_urls.add(current)
+
+                soup = BeautifulSoup(
+                    html, HTML_PARSER, parse_only=_LINK_STRAINER, from_encoding=charset
+                )
+                for a in soup.find_all("a", href=True):
+                    href = a["href"].strip()
+                    if href.startswith("#"):
+                        continue
+
+                    try:
+                        parsed = urlparse(urljoin(current, href))
+                    except ValueError:
+                        continue
+                    # Internal if same domain or relative
+                    if parsed.netloc not in ("", root_domain):
+                        continue
+
+                    normalized = parsed._replace(fragment="").geturl()
+
+                    if normalized not in queued and not should_skip_url(normalized):
+                        queued.add(normalized)
+                        to_visit.put_nowait(normalized)
+            finally:
+                to_visit.task_done()
+
+    async with make_async_session() as session:
+        workers = [
+            asyncio.create_task(worker(session)) for _ in range(MAX_CONNECTIONS)
+        ]
+        join_task = asyncio.create_task(to_visit.join())
+
+        # Workers only return by raising (e.g. Streamlit's StopException when
+        # the user hits Stop), so stop on whichever comes first: an empty
+        # frontier or a failed worker. Otherwise join() would wait forever.
+        done, _ = await asyncio.wait(
+            {join_task, *workers}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in (join_task, *workers):
+            task.cancel()
+        await asyncio.gather(join_task, *workers, return_exceptions=True)
 
-        progress_text.text(f"Crawling {len(seen)}/{max_pages}: {current}")
-        progress_bar.progress(len(seen) / max_pages)
+        for task in done:
+            if task is not join_task:
+                raise task.exception()
 
-        html = fetch_html(session, current)
-        if not html:
+    progress_text.empty()
+    progress_bar.empty()
+
+    return all_urls
+
+
+NON_VISIBLE_TAGS = ("script", "style", "noscript")
+
+
+def detect_encoding(html: bytes, charset: str | None = None) -> str | None:
+    """
+    First encoding bs4 would try for this page (HTTP header charset, known
+    BOM, declared charset, then cchardet's guess) that Python has a codec
+    for. Unlike UnicodeDammit, this doesn't decode the document to find out.
+    """
+    detector = EncodingDetector(
+        html, known_definite_encodings=[charset] if charset else None, is_html=True
+    )
+    for encoding in detector.encodings:
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
             continue
+        return encoding
+    return None
 
-        all_urls.add(current)
 
-        soup = BeautifulSoup(html, "html.parser")
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            if href.startswith("#"):
-                continue
+@lru_cache(maxsize=16)
+def html_parser_for(encoding: str | None) -> "lxml.html.HTMLParser | None":
+    """
+    One reusable lxml parser per document encoding, so each (worker)
+    process sets up a parser once instead of once per page. Comments and
+    processing instructions are kept: itertext() skips their content, and
+    removing them would glue the text on either side together.
+
+    libxml2 rejects many spellings Python accepts (latin_1, utf_8), so the
+    Python-canonical name is tried too. Returns None when libxml2 doesn't
+    support the encoding at all (cp437, euc_jp, ...).
+    """
+    names = [encoding]
+    if encoding is not None:
+        try:
+            names.append(codecs.lookup(encoding).name)
+        except LookupError:
+            pass
+
+    for name in names:
+        try:
+            return lxml.html.HTMLParser(encoding=name, recover=True)
+        except LookupError:
+            continue
+    return None
 
-            absolute = urljoin(current, href)
-            if not is_internal_url(absolute, root_domain):
-                continue
 
-            parsed = urlparse(absolute)
-            normalized = parsed._replace(fragment="").geturl()
+def extract_visible_text(html: bytes, charset: str | None = None) -> str:
+    """
+    `charset` is the one from the page's Content-Type header, if any.
+    """
+    if etree is None:
+        return extract_visible_text_bs4(html, charset)
 
-            if normalized not in seen and not should_skip_url(normalized):
-                to_visit.append(normalized)
+    # Let bs4 pick the encoding (cchardet-backed) so pages without a
+    # charset declaration aren't read as Latin-1 by libxml2
+    parser = html_parser_for(detect_encoding(html, charset))
+    if parser is None:
+        return extract_visible_text_bs4(html, charset)
 
-        time.sleep(delay)
+    try:
+        doc = lxml.html.fromstring(html, parser=parser)
+    except etree.ParserError:
+        # Empty or whitespace-only document
+        return ""
 
-    progress_text.empty()
-    progress_bar.empty()
+    # Empty non-visible elements but keep them (and their tails) as separate
+    # nodes, so the join below still puts a space where they were
+    for el in list(doc.iter(*NON_VISIBLE_TAGS)):
+        el.clear(keep_tail=True)
 
-    return all_urls
+    # str.split() collapses whitespace runs (NBSP included, like \s) in C
+    return " ".join(" ".join(doc.itertext()).split())
 
 
-def extract_visible_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+def extract_visible_text_bs4(html: bytes, charset: str | None = None) -> str:
+    soup = BeautifulSoup(html, HTML_PARSER, from_encoding=charset)
 
     # remove non-visible stuff
-    for tag in soup(["script", "style", "noscript"]):
+    for tag in soup(NON_VISIBLE_TAGS):
         tag.decompose()
 
     text = soup.get_text(separator=" ")
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    return " ".join(text.split())
 
 
-def search_terms_in_text(text: str, terms: list[str]) -> dict[str, list[str]]:
+PreparedTerms = tuple[tuple[str, str, int], ...]
+
+# Characters of context kept either side of a match
+SNIPPET_CONTEXT = 60
+
+
+def prepare_terms(terms: list[str]) -> PreparedTerms:
     """
-    Returns dict: term -> list of snippets.
+    Returns (term, lowercased term, lowercased length) for each term. Built
+    once per scan so no per-page work repeats the lowercasing.
     """
-    results = defaultdict(list)
-    lower_text = text.lower()
-
+    prepared = []
     for term in terms:
         lower_term = term.lower()
-        start = 0
-        while True:
-            idx = lower_text.find(lower_term, start)
-            if idx == -1:
-                break
-            snippet_start = max(0, idx - 60)
-            snippet_end = min(len(text), idx + len(term) + 60)
-            snippet = text[snippet_start:snippet_end].strip()
-            results[term].append(snippet)
-            start = idx + len(lower_term)
+        prepared.append((term, lower_term, len(lower_term)))
+    return tuple(prepared)
+
+
+@lru_cache(maxsize=8)
+def build_term_automaton(terms: PreparedTerms) -> ahocorasick.Automaton:
+    """
+    Aho-Corasick automaton over the lowercased terms. Cached so each
+    (worker) process builds it once per term list rather than once per page.
+    """
+    automaton = ahocorasick.Automaton()
+    for term, lower_term, term_len in terms:
+        # Terms that only differ in case share one key
+        if lower_term in automaton:
+            automaton.get(lower_term)[1].append(term)
+        else:
+            automaton.add_word(lower_term, (term_len, [term]))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=8)
+def build_term_database(terms: PreparedTerms) -> "hyperscan.Database":
+    """
+    Hyperscan block-mode database with one caseless literal per term;
+    match ids index into `terms`.
+    """
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+        | hyperscan.HS_FLAG_SOM_LEFTMOST
+    )
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[re.escape(term).encode("utf-8") for term, _, _ in terms],
+        ids=list(range(len(terms))),
+        flags=[flags] * len(terms),
+    )
+    return db
+
 
+def search_terms_with_hyperscan(text: str, terms: PreparedTerms) -> dict[str, list[str]]:
+    """
+    Hyperscan flavour of search_terms_in_text. Offsets are in UTF-8 bytes,
+    so the snippet context is measured in bytes here.
+    """
+    results = defaultdict(list)
+    data = text.encode("utf-8")
+    db = build_term_database(terms)
+    next_start: dict[int, int] = {}
+
+    def on_match(term_id: int, from_: int, to: int, flags: int, context) -> None:
+        if from_ < next_start.get(term_id, 0):
+            return
+        snippet_start = max(0, from_ - SNIPPET_CONTEXT)
+        snippet = data[snippet_start:to + SNIPPET_CONTEXT].decode("utf-8", "ignore").strip()
+        results[terms[term_id][0]].append(snippet)
+        next_start[term_id] = to
+
+    db.scan(data, match_event_handler=on_match)
     return results
 
 
+def build_snippets(text: str, spans: list[tuple[int, int]]) -> list[str]:
+    """
+    Returns the text around each (start, end) match, SNIPPET_CONTEXT
+    characters either side. Slicing clamps the end, so only the start
+    needs a bound.
+    """
+    return [
+        text[start - SNIPPET_CONTEXT if start > SNIPPET_CONTEXT else 0:end + SNIPPET_CONTEXT].strip()
+        for start, end in spans
+    ]
+
+
+def search_terms_in_text(text: str, terms: PreparedTerms) -> dict[str, list[str]]:
+    """
+    Returns dict: term -> list of snippets. `terms` comes from prepare_terms().
+    """
+    if hyperscan is not None:
+        return search_terms_with_hyperscan(text, terms)
+
+    spans = defaultdict(list)
+    lower_text = text.lower()
+    automaton = build_term_automaton(terms)
+
+    # Where the next match of each term may start, so repeats don't overlap
+    next_start: dict[str, int] = {}
+
+    for end_idx, (term_len, matched_terms) in automaton.iter(lower_text):
+        end = end_idx + 1
+        start = end - term_len
+
+        for term in matched_terms:
+            if start < next_start.get(term, 0):
+                continue
+            spans[term].append((start, end))
+            next_start[term] = end
+
+    return {term: build_snippets(text, term_spans) for term, term_spans in spans.items()}
+
+
+def parse_and_search(
+    html: bytes, charset: str | None, terms: PreparedTerms
+) -> list[tuple[str, str]]:
+    """
+    Returns (term, snippet) pairs for one page. Module-level so it can be
+    pickled into worker processes.
+    """
+    text = extract_visible_text(html, charset)
+    matches = search_terms_in_text(text, terms)
+    return [(term, snippet) for term, snippets in matches.items() for snippet in snippets]
+
+
+async def fetch_pages(urls: list[str], delay: float) -> list[Page | None]:
+    """
+    Fetches all URLs concurrently; results are in the same order as `urls`.
+    """
+    host_limits: dict[str, asyncio.Semaphore] = {}
+    page_cache = get_page_cache()
+    total = len(urls)
+    done = 0
+    last_tick = 0.0
+
+    scan_progress = st.progress(0.0)
+    status_text = st.empty()
+
+    async def fetch_one(session: aiohttp.ClientSession, url: str) -> Page | None:
+        nonlocal done, last_tick
+        page = await fetch_html_polite(session, url, host_limits, delay, page_cache)
+
+        done += 1
+        if progress_due(done, total, last_tick):
+            last_tick = time.monotonic()
+            status_text.text(f"Scanning {done}/{total}: {url}")
+            scan_progress.progress(done / total)
+        return page
+
+    async with make_async_session() as session:
+        pages = await asyncio.gather(*(fetch_one(session, url) for url in urls))
+
+    scan_progress.empty()
+    status_text.empty()
+
+    return pages
+
+
+def scan_urls(urls: list[str], terms: PreparedTerms, delay: float) -> pd.DataFrame:
+    """
+    Downloads every URL, then parses and searches the pages across all CPU
+    cores. Returns one row per term match, in the same order as `urls`.
+    """
+    pages = asyncio.run(fetch_pages(urls, delay))
+
+    # Many sites serve one body under several URLs (tracking params, aliases);
+    # parse and report each distinct body once, under its first URL
+    seen_hashes: set[int] = set()
+    fetched = []
+    for url, page in zip(urls, pages):
+        if page is None or not page[0]:
+            continue
+        h = xxhash.xxh3_64_intdigest(page[0])
+        if h in seen_hashes:
+            continue
+        seen_hashes.add(h)
+        fetched.append((url, page))
+
+    # Parallel columns rather than a dict per row
+    urls_col, terms_col, snip_col = [], [], []
+
+    if fetched:
+        with st.spinner(f"Searching {len(fetched)} pages for terms..."):
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                page_matches = pool.map(
+                    parse_and_search,
+                    [html for _, (html, _) in fetched],
+                    [charset for _, (_, charset) in fetched],
+                    repeat(terms),
+                    chunksize=8,
+                )
+                for (url, _), matches in zip(fetched, page_matches):
+                    for term, snippet in matches:
+                        urls_col.append(url)
+                        terms_col.append(term)
+                        snip_col.append(snippet)
+
+    return pd.DataFrame(
+        {
+            "url": urls_col,
+            "term": pd.Categorical(terms_col),
+            "snippet": snip_col,
+        }
+    )
+
+
 # =======================
 # STREAMLIT APP
 # =======================
@@ -268,11 +793,12 @@ def main():
     # --- Collect URLs via crawl ---
     if use_crawler:
         st.info(f"Crawling up to {crawl_limit} pages from {root_url} ...")
-        crawled_urls = crawl_site(
-            session=session,
-            start_url=root_url,
-            max_pages=crawl_limit,
-            delay=crawl_delay,
+        crawled_urls = asyncio.run(
+            crawl_site(
+                start_url=root_url,
+                max_pages=crawl_limit,
+                delay=crawl_delay,
+            )
         )
         st.write(f"Crawled **{len(crawled_urls)}** URLs.")
         all_urls.update(crawled_urls)
@@ -284,40 +810,14 @@ def main():
     st.success(f"Total unique URLs to scan: **{len(all_urls)}**")
 
     # --- Scan pages for terms ---
-    results_rows = []
-    scan_progress = st.progress(0.0)
-    status_text = st.empty()
-
-    for i, url in enumerate(sorted(all_urls)):
-        status_text.text(f"Scanning {i + 1}/{len(all_urls)}: {url}")
-        scan_progress.progress((i + 1) / len(all_urls))
-
-        html = fetch_html(session, url)
-        if not html:
-            continue
-
-        text = extract_visible_text(html)
-        matches = search_terms_in_text(text, terms)
-
-        for term, snippets in matches.items():
-            for snippet in snippets:
-                results_rows.append(
-                    {
-                        "url": url,
-                        "term": term,
-                        "snippet": snippet,
-                    }
-                )
-
-        # Small delay mainly for crawled URLs; sitemap-only runs will still respect it
-        time.sleep(0.1)
-
-    scan_progress.empty()
-    status_text.empty()
+    # Only throttle when the user asked for a crawl delay; sitemap-only runs
+    # are already bounded by the per-host connection limit
+    url_list = sorted(all_urls)
+    scan_delay = crawl_delay if use_crawler else 0.0
+    df = scan_urls(url_list, prepare_terms(terms), delay=scan_delay)
 
     # --- Show results ---
-    if results_rows:
-        df = pd.DataFrame(results_rows)
+    if not df.empty:
         st.subheader("Matches found")
         st.write(
             f"Found **{len(df)}** matches across **{df['url'].nunique()}** pages."
@@ -0,0 +1,15 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+APP_PATH = Path(__file__).resolve().parent.parent / "brand-scanner-app.py"
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The app script, loaded once as a module (its filename isn't importable)."""
+    spec = importlib.util.spec_from_file_location("brand_scanner_app", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
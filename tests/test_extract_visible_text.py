@@ -0,0 +1,52 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "charset, codec",
+    [
+        ("latin_1", "latin-1"),
+        ("utf_8", "utf-8"),
+        ("koi8_r", "koi8-r"),
+        ("cp437", "cp437"),
+        ("euc_jp", "euc-jp"),
+        ("mac_roman", "mac-roman"),
+    ],
+)
+def test_unusual_charset_declaration(app, charset, codec):
+    html = f'<html><head><meta charset="{charset}"></head><body><p>Old Brand Name</p></body></html>'
+    assert app.extract_visible_text(html.encode(codec)) == "Old Brand Name"
+
+
+def test_declared_charset_is_used_for_non_ascii_text(app):
+    html = '<html><head><meta charset="latin_1"></head><body><p>Café Old Brand</p></body></html>'
+    assert app.extract_visible_text(html.encode("latin-1")) == "Café Old Brand"
+
+
+@pytest.mark.parametrize(
+    "removed",
+    [
+        "<script>var x = 1;</script>",
+        "<style>p { color: red; }</style>",
+        "<noscript>Enable JS</noscript>",
+        "<!-- hidden -->",
+        "<?pi data?>",
+    ],
+)
+def test_removed_content_still_separates_words(app, removed):
+    html = f"<html><body><p>Welcome to OldBrand{removed}today</p></body></html>"
+    assert app.extract_visible_text(html.encode()) == "Welcome to OldBrand today"
+    assert app.extract_visible_text_bs4(html.encode()) == "Welcome to OldBrand today"
+
+
+def test_undeclared_utf8_is_not_read_as_latin1(app):
+    html = "<html><body><p>Café Old Brand</p></body></html>"
+    assert app.extract_visible_text(html.encode("utf-8")) == "Café Old Brand"
+
+
+def test_charset_from_http_header_is_used(app):
+    html = "<html><body><p>Bienvenido a La Piñata Española</p></body></html>"
+    body = html.encode("latin-1")
+
+    expected = "Bienvenido a La Piñata Española"
+    assert app.extract_visible_text(body, "iso-8859-1") == expected
+    assert app.extract_visible_text_bs4(body, "iso-8859-1") == expected
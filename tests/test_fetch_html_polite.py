@@ -0,0 +1,30 @@
+import asyncio
+
+
+def test_delay_serializes_requests_to_a_host(app, monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch(session, url, page_cache=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return b"<html></html>"
+
+    monkeypatch.setattr(app, "fetch_html_async", fake_fetch)
+
+    async def crawl(delay):
+        host_limits = {}
+        urls = [f"https://example.com/{i}" for i in range(5)]
+        await asyncio.gather(
+            *(app.fetch_html_polite(None, url, host_limits, delay) for url in urls)
+        )
+
+    asyncio.run(crawl(0.01))
+    assert peak == 1
+
+    peak = 0
+    asyncio.run(crawl(0.0))
+    assert peak > 1
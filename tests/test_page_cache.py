@@ -0,0 +1,27 @@
+def test_evicts_oldest_pages_over_byte_budget(app):
+    cache = app.PageCache(max_bytes=10, ttl=60)
+    cache.put("a", '"a"', (b"12345", None))
+    cache.put("b", '"b"', (b"12345", None))
+    cache.put("c", '"c"', (b"123", None))
+
+    assert cache.get("a") is None
+    assert cache.get("b") == ('"b"', (b"12345", None))
+    assert cache.get("c") == ('"c"', (b"123", None))
+
+
+def test_skips_pages_larger_than_budget(app):
+    cache = app.PageCache(max_bytes=4, ttl=60)
+    cache.put("a", '"a"', (b"12345", None))
+    assert cache.get("a") is None
+
+
+def test_expires_entries_after_ttl(app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(app.time, "monotonic", lambda: now[0])
+
+    cache = app.PageCache(max_bytes=100, ttl=60)
+    cache.put("a", '"a"', (b"body", None))
+    now[0] += 59
+    assert cache.get("a") == ('"a"', (b"body", None))
+    now[0] += 2
+    assert cache.get("a") is None
@@ -0,0 +1,67 @@
+class FakeResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Serves canned sitemap documents and records every URL requested."""
+
+    def __init__(self, documents: dict[str, str]):
+        self.documents = documents
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        return FakeResponse(self.documents[url].encode())
+
+
+def sitemap_index(*locs: str) -> str:
+    entries = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0"?><sitemapindex>{entries}</sitemapindex>'
+
+
+def url_set(*locs: str) -> str:
+    entries = "".join(f"<url><loc>{loc}</loc></url>" for loc in locs)
+    return f'<?xml version="1.0"?><urlset>{entries}</urlset>'
+
+
+def test_self_referencing_index_is_read_once(app):
+    session = FakeSession(
+        {
+            "https://example.com/sitemap.xml": sitemap_index(
+                "https://example.com/sitemap.xml",
+                "https://example.com/pages.xml",
+            ),
+            "https://example.com/pages.xml": url_set("https://example.com/a"),
+        }
+    )
+
+    urls = app.get_urls_from_sitemap(session, "https://example.com/sitemap.xml")
+
+    assert urls == {"https://example.com/a"}
+    assert sorted(session.requested) == [
+        "https://example.com/pages.xml",
+        "https://example.com/sitemap.xml",
+    ]
+
+
+def test_index_cycle_between_two_sitemaps_terminates(app):
+    session = FakeSession(
+        {
+            "https://example.com/a.xml": sitemap_index(
+                "https://example.com/b.xml", "https://example.com/pages.xml"
+            ),
+            "https://example.com/b.xml": sitemap_index("https://example.com/a.xml"),
+            "https://example.com/pages.xml": url_set(
+                "https://example.com/x", "https://example.com/y"
+            ),
+        }
+    )
+
+    urls = app.get_urls_from_sitemap(session, "https://example.com/a.xml")
+
+    assert urls == {"https://example.com/x", "https://example.com/y"}
+    assert len(session.requested) == 3